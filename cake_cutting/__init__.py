@@ -1,2 +1,55 @@
-from .algorithm import arrangement_algorithm
-from .basics import MatrixShape, MatrixPiece, CakeContainer, PieceMapping
+"""
+Submodules are loaded lazily (PEP 562): `import cake_cutting` only imports this file,
+the shapes in `basics` or the packing engine in `algorithm` are imported on first access.
+"""
+import sys
+
+# Keep `typing` out of the bare import, it costs more than the whole package
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from .algorithm import arrangement_algorithm, arrangement_generator, rearrangement_algorithm
+    from .basics import MatrixShape, MatrixPiece, CakeContainer, PieceMapping
+    from .basics import TensorShape, TensorPiece, TensorContainer, TensorPieceMapping
+    from .tensor_algorithm import tensor_arrangement_algorithm
+
+_SUBMODULES = ("algorithm", "basics", "utils", "verification", "tensor_algorithm")
+
+_LAZY_ATTRIBUTES = {
+    "arrangement_algorithm": "algorithm",
+    "arrangement_generator": "algorithm",
+    "rearrangement_algorithm": "algorithm",
+    "MatrixShape": "basics",
+    "MatrixPiece": "basics",
+    "CakeContainer": "basics",
+    "PieceMapping": "basics",
+    "TensorShape": "basics",
+    "TensorPiece": "basics",
+    "TensorContainer": "basics",
+    "TensorPieceMapping": "basics",
+    "tensor_arrangement_algorithm": "tensor_algorithm",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES.keys())
+
+
+def _import_submodule(name):
+    # `importlib` is avoided since it pulls in `warnings`
+    module_name = f"{__name__}.{name}"
+    __import__(module_name)
+    return sys.modules[module_name]
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return _import_submodule(name)
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(_import_submodule(module_name), name)
+    # Cache it so the next lookup won't go through __getattr__ again
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals().keys()) | set(__all__) | set(_SUBMODULES))
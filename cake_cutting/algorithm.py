@@ -1,7 +1,7 @@
 import logging
 from functools import reduce
 from math import floor
-from typing import Union, Mapping, List, Sequence, Tuple
+from typing import Union, Mapping, List, Sequence, Tuple, Iterable, Iterator
 
 from .basics import CakeContainer, MatrixShape, MatrixPiece, PieceMapping
 from .utils import SortedCollection
@@ -120,6 +120,7 @@ def fill_with_small_block(
     for i, (mat_id, sub_piece) in enumerate(blocks):
         if sub_piece.shape in piece.shape:
             if sub_piece.area > max_size:
+                max_size = sub_piece.area
                 max_id = i
     if max_id is None:
         return []
@@ -170,17 +171,100 @@ def fill_with_small_block(
         return result_list
 
 
-def arrangement_algorithm(
+def free_pieces(cake_container: CakeContainer) -> List[MatrixPiece]:
+    """
+    Split the free space of the container into non-overlapping pieces
+    :param cake_container: container to inspect
+    :return: free pieces, the larger ones first
+    """
+    container_size = cake_container.container_size
+    locations = [piece.container_loc for piece in cake_container.pieces]
+    xs = sorted({0, container_size.width} | {loc.left for loc in locations} | {loc.right for loc in locations})
+    ys = sorted({0, container_size.height} | {loc.top for loc in locations} | {loc.bottom for loc in locations})
+    x_index = {x: i for i, x in enumerate(xs)}
+    y_index = {y: i for i, y in enumerate(ys)}
+    # used[row][col] marks whether the cell of the compressed grid is used
+    used = [[False] * (len(xs) - 1) for _ in range(len(ys) - 1)]
+    for loc in locations:
+        for row in range(y_index[loc.top], y_index[loc.bottom]):
+            for col in range(x_index[loc.left], x_index[loc.right]):
+                used[row][col] = True
+    result = []
+    for row in range(len(ys) - 1):
+        for col in range(len(xs) - 1):
+            if used[row][col]:
+                continue
+            col_end = col
+            while col_end < len(xs) - 1 and not used[row][col_end]:
+                col_end += 1
+            row_end = row + 1
+            while row_end < len(ys) - 1 and not any(used[row_end][col:col_end]):
+                row_end += 1
+            for r in range(row, row_end):
+                for c in range(col, col_end):
+                    used[r][c] = True
+            result.append(MatrixPiece(xs[col], ys[row], xs[col_end] - xs[col], ys[row_end] - ys[row]))
+    result.sort(key=lambda piece: piece.area, reverse=True)
+    return result
+
+
+def fill_free_piece(
+        piece: MatrixPiece,
+        sc_width: SortedCollection,
+        sc_height: SortedCollection,
+        blocks: List[Tuple[object, MatrixPiece]],
+        container_size: MatrixShape
+) -> List[PieceMapping]:
+    """
+    Trying to consume a free piece of the container with bars first, then small blocks
+    :param piece: the piece to consume
+    :param sc_width: fit-width pieces sorted by height
+    :param sc_height: fit-height pieces sorted by width
+    :param blocks: small pieces to fill
+    :param container_size: container_size
+    :return:
+    """
+    pieces = []
+    if piece.width == container_size.width:
+        while piece.height > 0:
+            try:
+                mat_id, piece_pop = sc_width.pop_le(piece.height)
+            except ValueError as _:  # Can't pop element out
+                break
+            pieces.append(PieceMapping(
+                original_id=mat_id,
+                original_loc=piece_pop,
+                container_loc=MatrixPiece(piece.left, piece.top, piece_pop.width, piece_pop.height),
+            ))
+            piece = MatrixPiece(piece.left, piece.top + piece_pop.height, piece.width, piece.height - piece_pop.height)
+    if piece.height == container_size.height:
+        while piece.width > 0:
+            try:
+                mat_id, piece_pop = sc_height.pop_le(piece.width)
+            except ValueError as _:  # Can't pop element out
+                break
+            pieces.append(PieceMapping(
+                original_id=mat_id,
+                original_loc=piece_pop,
+                container_loc=MatrixPiece(piece.left, piece.top, piece_pop.width, piece_pop.height),
+            ))
+            piece = MatrixPiece(piece.left + piece_pop.width, piece.top, piece.width - piece_pop.width, piece.height)
+    if piece.area > 0:
+        pieces += fill_with_small_block(piece, blocks)
+    return pieces
+
+
+def check_matrixes(
         matrixes: Union[Sequence[MatrixShape], Mapping[str, MatrixShape]],
         container_size: MatrixShape,
         padding_size: MatrixShape = None
-) -> List[CakeContainer]:
+) -> Tuple[Mapping[str, MatrixShape], MatrixShape]:
     """
-    Give an arrangement for input matrixes
+    Check the input of arrangement
     :param matrixes: Padded matrix
     :param container_size: container_size
     :param padding_size: padding size default (0,0) means no padding
-    :return:
+    :return: matrixes as mapping, padding size
     """
     if isinstance(matrixes, Sequence):
         matrixes: Mapping[str, MatrixShape] = {i: v for i, v in enumerate(matrixes)}
@@ -195,21 +279,45 @@ def arrangement_algorithm(
     for mat_id, mat in matrixes.items():
         if padding_size_mat not in mat:
             raise ValueError(f"Matrix {mat_id} is too small. {mat.shape} < {padding_size_mat.shape} ")
+    return matrixes, padding_size
 
-    containers: List[CakeContainer] = []
 
-    # cut all large images in pieces, make them all less than container size
-    pieces_collection = reduce(
+def decompose_matrixes(
+        matrixes: Mapping[str, MatrixShape],
+        container_size: MatrixShape,
+        padding_size: MatrixShape
+) -> PiecesCollection:
+    """
+    Cut all large images in pieces, make them all less than container size
+    :param matrixes: Padded matrix
+    :param container_size: container_size
+    :param padding_size: padding size
+    :return:
+    """
+    return reduce(
         lambda a, b: a + b,
         (
             matrix_decomposition(mat_id, mat, container_size, padding_size)
             for mat_id, mat in matrixes.items()
-        )
+        ),
+        PiecesCollection()
     )
 
-    # extract the piece which can obtain whole container
-    for mat_id, full_piece in pieces_collection.full:
-        containers.append(CakeContainer(
+
+def full_containers(
+        full_pieces: List[Tuple[object, MatrixPiece]],
+        container_size: MatrixShape,
+        padding_size: MatrixShape
+) -> Iterator[CakeContainer]:
+    """
+    Give a container for each piece which can obtain whole container
+    :param full_pieces: pieces in container size
+    :param container_size: container_size
+    :param padding_size: padding size
+    :return:
+    """
+    for mat_id, full_piece in full_pieces:
+        yield CakeContainer(
             container_size,
             [PieceMapping(
                 original_id=mat_id,
@@ -217,7 +325,23 @@ def arrangement_algorithm(
                 original_loc=full_piece,
                 padding=padding_size
             )]
-        ))
+        )
+
+
+def arrange_pieces(
+        pieces_collection: PiecesCollection,
+        container_size: MatrixShape,
+        padding_size: MatrixShape
+) -> Iterator[CakeContainer]:
+    """
+    Place the pieces into new containers, each container is given out once it won't be changed
+    :param pieces_collection: pieces to place, the list of small pieces will be consumed
+    :param container_size: container_size
+    :param padding_size: padding size
+    :return:
+    """
+    # extract the piece which can obtain whole container
+    yield from full_containers(pieces_collection.full, container_size, padding_size)
 
     # process the fit-width pieces
     sc_width = SortedCollection(pieces_collection.fit_width, key=lambda x: x[1].height)
@@ -244,7 +368,7 @@ def arrangement_algorithm(
                 container_size.width, remain_height
             )
             pieces += fill_with_small_block(rest_piece, pieces_collection.small)
-        containers.append(CakeContainer(container_size, pieces))
+        yield CakeContainer(container_size, pieces)
         pieces = []  # reset pieces slots
 
     # process the fit-width pieces
@@ -272,15 +396,148 @@ def arrangement_algorithm(
                 remain_width, container_size.height
             )
             pieces += fill_with_small_block(rest_piece, pieces_collection.small)
-        containers.append(CakeContainer(container_size, pieces))
+        yield CakeContainer(container_size, pieces)
         pieces = []  # reset pieces slots
 
     while len(pieces_collection.small) > 0:
-        containers.append(CakeContainer(
+        yield CakeContainer(
             container_size,
             fill_with_small_block(
                 MatrixPiece(0, 0, container_size.width, container_size.height),
                 pieces_collection.small
             )
-        ))
-    return containers
+        )
+
+
+def arrangement_algorithm(
+        matrixes: Union[Sequence[MatrixShape], Mapping[str, MatrixShape]],
+        container_size: MatrixShape,
+        padding_size: MatrixShape = None
+) -> List[CakeContainer]:
+    """
+    Give an arrangement for input matrixes
+    :param matrixes: Padded matrix
+    :param container_size: container_size
+    :param padding_size: padding size default (0,0) means no padding
+    :return:
+    """
+    return list(arrangement_generator(matrixes, container_size, padding_size))
+
+
+def arrangement_generator(
+        matrixes: Union[Sequence[MatrixShape], Mapping[str, MatrixShape]],
+        container_size: MatrixShape,
+        padding_size: MatrixShape = None
+) -> Iterator[CakeContainer]:
+    """
+    Same as arrangement_algorithm, but give out each container as soon as it won't be changed,
+    so the consumer can process it while the rest are still packing.
+    The input is checked before returning the generator.
+    :param matrixes: Padded matrix
+    :param container_size: container_size
+    :param padding_size: padding size default (0,0) means no padding
+    :return: generator of containers, in the same order as arrangement_algorithm
+    """
+    matrixes, padding_size = check_matrixes(matrixes, container_size, padding_size)
+    return _arrangement_generator(matrixes, container_size, padding_size)
+
+
+def _arrangement_generator(
+        matrixes: Mapping[str, MatrixShape],
+        container_size: MatrixShape,
+        padding_size: MatrixShape
+) -> Iterator[CakeContainer]:
+    rest_collection = PiecesCollection()
+    for mat_id, mat in matrixes.items():
+        pieces_collection = matrix_decomposition(mat_id, mat, container_size, padding_size)
+        # The full pieces don't depend on other matrixes, give them out while decomposing
+        yield from full_containers(pieces_collection.full, container_size, padding_size)
+        rest_collection.fit_width += pieces_collection.fit_width
+        rest_collection.fit_height += pieces_collection.fit_height
+        rest_collection.small += pieces_collection.small
+    yield from arrange_pieces(rest_collection, container_size, padding_size)
+
+
+def rearrangement_algorithm(
+        containers: List[CakeContainer],
+        container_size: MatrixShape,
+        added: Mapping[str, MatrixShape] = None,
+        removed: Iterable = (),
+        padding_size: MatrixShape = None
+) -> Tuple[List[CakeContainer], List[CakeContainer]]:
+    """
+    Update an arrangement in place after some matrixes were added or removed.
+    The pieces of removed matrixes are dropped, the pieces of added matrixes are placed into
+    the containers emptied by the removal and the free space of existing containers first,
+    the rest of them are placed into new containers.
+    Containers without any change are kept as they were.
+    :param containers: the arrangement to update, the containers still empty after adding are removed from it
+    (so the containers after them move forward) and the new containers are appended to it
+    :param container_size: container_size
+    :param added: the matrixes to add, ID shouldn't be arranged already unless it's also removed
+    :param removed: the ID of arranged matrixes to remove
+    :param padding_size: padding size default (0,0) means no padding
+    :return: (changed, dropped) the changed containers including the new ones, and the containers removed
+    """
+    added, padding_size = check_matrixes(added if added is not None else {}, container_size, padding_size)
+    removed = set(removed)
+    arranged_ids = set(piece.original_id for cake_container in containers for piece in cake_container.pieces)
+    for mat_id in removed:
+        if mat_id not in arranged_ids:
+            raise ValueError(f"Matrix {mat_id} is not arranged.")
+    for mat_id in added:
+        if mat_id in arranged_ids and mat_id not in removed:
+            raise ValueError(f"Matrix {mat_id} is already arranged.")
+
+    changed: List[CakeContainer] = []
+    emptied: List[CakeContainer] = []
+    for cake_container in containers:
+        pieces = [piece for piece in cake_container.pieces if piece.original_id not in removed]
+        if len(pieces) < len(cake_container.pieces):
+            cake_container.pieces = pieces
+            if len(pieces) == 0:
+                emptied.append(cake_container)
+            else:
+                changed.append(cake_container)
+
+    pieces_collection = decompose_matrixes(added, container_size, padding_size)
+    # Reuse the emptied containers for the full pieces
+    for cake_container in emptied:
+        if len(pieces_collection.full) == 0:
+            break
+        cake_container.pieces = next(full_containers(
+            [pieces_collection.full.pop(0)], container_size, padding_size
+        )).pieces
+    sc_width = SortedCollection(pieces_collection.fit_width, key=lambda id_piece: id_piece[1].height)
+    sc_height = SortedCollection(pieces_collection.fit_height, key=lambda id_piece: id_piece[1].width)
+
+    # Try the containers already changed first, keep the others stable as much as possible
+    changed_ids = set(id(cake_container) for cake_container in changed + emptied)
+    candidates = emptied + changed + [
+        cake_container for cake_container in containers if id(cake_container) not in changed_ids
+    ]
+    for cake_container in candidates:
+        if len(sc_width) == 0 and len(sc_height) == 0 and len(pieces_collection.small) == 0:
+            break
+        if sum(piece.area for piece in cake_container.pieces) >= container_size.area:
+            continue
+        new_pieces = []
+        for piece in free_pieces(cake_container):
+            new_pieces += fill_free_piece(piece, sc_width, sc_height, pieces_collection.small, container_size)
+        if len(new_pieces) > 0:
+            cake_container.pieces += new_pieces
+            if id(cake_container) not in changed_ids:
+                changed_ids.add(id(cake_container))
+                changed.append(cake_container)
+
+    dropped = [cake_container for cake_container in emptied if len(cake_container.pieces) == 0]
+    changed = [cake_container for cake_container in emptied if len(cake_container.pieces) > 0] + changed
+    if len(dropped) > 0:
+        dropped_ids = set(id(cake_container) for cake_container in dropped)
+        containers[:] = [cake_container for cake_container in containers if id(cake_container) not in dropped_ids]
+
+    pieces_collection.fit_width = list(sc_width)
+    pieces_collection.fit_height = list(sc_height)
+    new_containers = list(arrange_pieces(pieces_collection, container_size, padding_size))
+    containers += new_containers
+    return changed + new_containers, dropped
@@ -1,7 +1,17 @@
-import logging
-from typing import List, Tuple
+"""
+The shape types are imported by the lightest planning code,
+so neither `typing` nor `logging` is imported here until they are really needed.
+"""
+from __future__ import annotations
 
-log = logging.getLogger(__file__)
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import List, Tuple, Sequence
+
+
+def _log():
+    import logging
+    return logging.getLogger(__file__)
 
 
 class MatrixShape:
@@ -32,7 +42,7 @@ class MatrixShape:
     def __eq__(self, other):
         if isinstance(other, MatrixShape):
             return other.width == self.width and other.height == self.height
-        elif isinstance(other, Tuple):
+        elif isinstance(other, tuple):
             if len(other) == 2:
                 return self.tuple == other
             else:
@@ -105,8 +115,148 @@ class CakeContainer:
 
 
     def display(self):
+        log = _log()
         log.debug("PieceMapping:")
         for i, piece in enumerate(self.pieces):
             log.debug("  {} -> {}".format(
                 i, str(piece)
             ))
+
+
+class TensorShape:
+    """
+    N-dimensional version of MatrixShape, for volumes like (width, height, depth) or with a channel axis.
+    """
+
+    def __init__(self, *dims: int):
+        if len(dims) == 1 and isinstance(dims[0], (list, tuple)):
+            dims = dims[0]
+        self.dims: Tuple[int, ...] = tuple(dims)
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self.dims
+
+    @property
+    def ndim(self):
+        return len(self.dims)
+
+    def __contains__(self, item):
+        if isinstance(item, TensorShape):
+            return item.ndim == self.ndim and all(i < s for i, s in zip(item.dims, self.dims))
+        else:
+            raise Exception(f"Unknown type: {str(type(item))}")
+
+    def fits(self, container) -> bool:
+        """
+        :param container: the shape to put in
+        :return: True if this shape can be put in the container (edges may touch)
+        """
+        return self.ndim == container.ndim and all(s <= c for s, c in zip(self.dims, container.dims))
+
+    @property
+    def volume(self):
+        volume = 1
+        for d in self.dims:
+            volume *= d
+        return volume
+
+    @property
+    def tuple(self):
+        return self.dims
+
+    @classmethod
+    def from_matrix_shape(cls, matrix_shape: MatrixShape):
+        return cls(matrix_shape.width, matrix_shape.height)
+
+    def to_matrix_shape(self) -> MatrixShape:
+        if self.ndim != 2:
+            raise ValueError(f"Can't convert {self.ndim}D shape to MatrixShape")
+        return MatrixShape(*self.dims)
+
+    def __eq__(self, other):
+        if isinstance(other, TensorShape):
+            return other.dims == self.dims
+        elif isinstance(other, tuple):
+            return self.dims == other
+        else:
+            raise TypeError("Can't compare between TensorShape and {}".format(
+                str(type(other))
+            ))
+
+    def __str__(self):
+        return "x".join(str(d) for d in self.dims)
+
+
+class TensorPiece:
+    """
+    N-dimensional version of MatrixPiece
+    """
+
+    def __init__(self, offset: Sequence[int], dims: Sequence[int]):
+        if len(offset) != len(dims):
+            raise ValueError(f"Offset {tuple(offset)} and shape {tuple(dims)} have different dimensions")
+        self.offset: Tuple[int, ...] = tuple(offset)
+        self.dims: Tuple[int, ...] = tuple(dims)
+
+    @property
+    def ndim(self):
+        return len(self.dims)
+
+    @property
+    def end(self) -> Tuple[int, ...]:
+        return tuple(o + d for o, d in zip(self.offset, self.dims))
+
+    @property
+    def location(self):
+        return self.offset + self.end
+
+    @property
+    def shape(self) -> TensorShape:
+        return TensorShape(self.dims)
+
+    @property
+    def volume(self):
+        return self.shape.volume
+
+    @property
+    def slices(self) -> Tuple[slice, ...]:
+        return tuple(slice(o, o + d) for o, d in zip(self.offset, self.dims))
+
+    @classmethod
+    def from_matrix_piece(cls, matrix_piece: MatrixPiece):
+        return cls((matrix_piece.left, matrix_piece.top), (matrix_piece.width, matrix_piece.height))
+
+    def __str__(self):
+        return "[{}]".format(",".join(f"{o}:{o + d}" for o, d in zip(self.offset, self.dims)))
+
+
+class TensorPieceMapping:
+    def __init__(self, original_id, container_loc: TensorPiece, original_loc: TensorPiece, padding: TensorShape = None):
+        self.padding = padding if padding is not None else TensorShape([0] * original_loc.ndim)
+        self.original_loc = original_loc
+        self.container_loc = container_loc
+        self.original_id = original_id
+        if original_loc.shape != container_loc.shape:
+            raise ValueError(f"Can't mapping from size {original_loc.shape.shape} to size {container_loc.shape.shape}!")
+
+    @property
+    def volume(self):
+        return self.container_loc.volume
+
+    def __str__(self):
+        return f"{self.original_id}:{str(self.original_loc)}->{str(self.container_loc)}"
+
+
+class TensorContainer:
+    def __init__(self, container_size: TensorShape, pieces: List[TensorPieceMapping]):
+        self.container_size = container_size
+        self.pieces = pieces
+
+    def display(self):
+        log = _log()
+        log.debug("TensorPieceMapping:")
+        for i, piece in enumerate(self.pieces):
+            log.debug("  {} -> {}".format(
+                i, str(piece)
+            ))
@@ -0,0 +1,212 @@
+"""
+N-dimensional version of the algorithm, used for volumes (e.g. medical scans) and channel-aware cutting.
+Each axis has its own padding. The channel axes are never cut or stacked along: every tensor must have
+the same size as the container on them, and each piece spans the whole channel extent of its container.
+2D inputs are delegated to arrangement_algorithm, which is faster and gives the same arrangement.
+"""
+import logging
+from bisect import bisect_left
+from itertools import product
+from typing import Union, Mapping, List, Sequence, Tuple
+
+from .algorithm import arrangement_algorithm
+from .basics import TensorShape, TensorPiece, TensorPieceMapping, TensorContainer
+
+log = logging.getLogger(__file__)
+
+
+def check_tensors(
+        tensors: Union[Sequence[TensorShape], Mapping[str, TensorShape]],
+        container_size: TensorShape,
+        padding_size: TensorShape = None,
+        channel_axes: Sequence[int] = ()
+) -> Tuple[Mapping[str, TensorShape], TensorShape]:
+    """
+    Check the input of arrangement
+    :param tensors: Padded tensors
+    :param container_size: container_size
+    :param padding_size: padding size default (0,...) means no padding
+    :param channel_axes: the axes of channels
+    :return: tensors as mapping, padding size
+    """
+    if isinstance(tensors, Sequence):
+        tensors: Mapping[str, TensorShape] = {i: v for i, v in enumerate(tensors)}
+
+    padding_size = padding_size if padding_size is not None else TensorShape([0] * container_size.ndim)
+
+    # Value check
+    if padding_size.ndim != container_size.ndim:
+        raise ValueError(f"Padding size {padding_size.shape} should have {container_size.ndim} dimensions")
+    for axis in channel_axes:
+        if not 0 <= axis < container_size.ndim:
+            raise ValueError(f"Channel axis {axis} out of {container_size.ndim} dimensions")
+        if padding_size.dims[axis] != 0:
+            raise ValueError(f"Channel axis {axis} shouldn't be padded. {padding_size.shape}")
+    padding_size_mat = TensorShape([p * 2 for p in padding_size.dims])
+    if padding_size_mat not in container_size:
+        raise ValueError(
+            f"Container's size {container_size.shape} should larger than padding size {padding_size_mat.shape}")
+    for mat_id, mat in tensors.items():
+        if mat.ndim != container_size.ndim:
+            raise ValueError(f"Tensor {mat_id} should have {container_size.ndim} dimensions. {mat.shape}")
+        if padding_size_mat not in mat:
+            raise ValueError(f"Tensor {mat_id} is too small. {mat.shape} < {padding_size_mat.shape} ")
+        for axis in channel_axes:
+            if mat.dims[axis] != container_size.dims[axis]:
+                raise ValueError(
+                    f"Tensor {mat_id} has {mat.dims[axis]} channels on axis {axis}, "
+                    f"but the container has {container_size.dims[axis]}")
+    return tensors, padding_size
+
+
+def tensor_decomposition(
+        mat_id,
+        mat: TensorShape,
+        container_size: TensorShape,
+        padding_size: TensorShape
+) -> List[Tuple[object, TensorPiece]]:
+    """
+    Split single tensor into pieces not larger than the container, the same way as matrix_decomposition
+    :param mat_id:
+    :param mat:
+    :param container_size:
+    :param padding_size:
+    :return:
+    """
+    # The segments of each axis: whole blocks overlapped by padding, then the edge if any
+    axis_segments = []
+    for size, container, padding in zip(mat.dims, container_size.dims, padding_size.dims):
+        valid = container - 2 * padding
+        count = (size - 2 * padding) // valid
+        segments = [(i * valid, container) for i in range(count)]
+        start = valid * count
+        if size - start > padding * 2:
+            segments.append((start, size - start))
+        axis_segments.append(segments)
+    return [
+        (mat_id, TensorPiece([o for o, _ in segments], [d for _, d in segments]))
+        for segments in product(*axis_segments)
+    ]
+
+
+def fill_with_blocks(
+        box: TensorPiece,
+        blocks: List[Tuple[object, TensorPiece]],
+        block_keys: List[int],
+        channel_axes: Sequence[int] = ()
+) -> List[TensorPieceMapping]:
+    """
+    Trying to consume the box with the largest fitting blocks, the rest of the box is cut by guillotine
+    :param box: the box to consume
+    :param blocks: pieces to fill, sorted by volume (large first)
+    :param block_keys: negative volume of blocks, to bisect with
+    :param channel_axes: the axes never cut, a block must span the whole box on them
+    :return:
+    """
+    result_list = []
+    boxes = [box]
+    while boxes and blocks:
+        box = boxes.pop()
+        box_shape = box.shape
+        # Skip the blocks larger than the box
+        start = bisect_left(block_keys, -box_shape.volume)
+        index = next((
+            i for i in range(start, len(blocks))
+            if blocks[i][1].shape.fits(box_shape) and all(blocks[i][1].dims[a] == box.dims[a] for a in channel_axes)
+        ), None)
+        if index is None:
+            continue
+        del block_keys[index]
+        mat_id, block = blocks.pop(index)
+        result_list.append(TensorPieceMapping(
+            original_id=mat_id,
+            original_loc=block,
+            container_loc=TensorPiece(box.offset, block.dims)
+        ))
+        # Cut the axis with the largest rest part first, the later cuts are limited by the block
+        rest_sizes = [
+            (b - p) * box_shape.volume // b if b > 0 else 0
+            for b, p in zip(box.dims, block.dims)
+        ]
+        dims = list(box.dims)
+        rest_boxes = []
+        for axis in sorted(range(box.ndim), key=lambda a: rest_sizes[a], reverse=True):
+            if axis in channel_axes:
+                continue
+            if box.dims[axis] > block.dims[axis]:
+                offset = list(box.offset)
+                offset[axis] += block.dims[axis]
+                rest_dims = list(dims)
+                rest_dims[axis] = box.dims[axis] - block.dims[axis]
+                rest_boxes.append(TensorPiece(offset, rest_dims))
+            dims[axis] = block.dims[axis]
+        # Fill the largest rest part first
+        boxes += reversed(rest_boxes)
+    return result_list
+
+
+def tensor_arrangement_algorithm(
+        tensors: Union[Sequence[TensorShape], Mapping[str, TensorShape]],
+        container_size: TensorShape,
+        padding_size: TensorShape = None,
+        channel_axes: Sequence[int] = ()
+) -> List[TensorContainer]:
+    """
+    Give an arrangement for input tensors
+    :param tensors: Padded tensors
+    :param container_size: container_size
+    :param padding_size: padding size of each axis default (0,...) means no padding
+    :param channel_axes: the axes of channels, tensors must have the container's size on them and no padding
+    :return:
+    """
+    tensors, padding_size = check_tensors(tensors, container_size, padding_size, channel_axes)
+
+    # The 2D engine never cuts or stacks along an axis on which the tensors are as large as the container,
+    # so it's also correct with channel axes
+    if container_size.ndim == 2:
+        return [
+            TensorContainer(container_size, [
+                TensorPieceMapping(
+                    original_id=piece.original_id,
+                    container_loc=TensorPiece.from_matrix_piece(piece.container_loc),
+                    original_loc=TensorPiece.from_matrix_piece(piece.original_loc),
+                    padding=TensorShape.from_matrix_shape(piece.padding)
+                )
+                for piece in cake_container.pieces
+            ])
+            for cake_container in arrangement_algorithm(
+                {mat_id: mat.to_matrix_shape() for mat_id, mat in tensors.items()},
+                container_size.to_matrix_shape(),
+                padding_size.to_matrix_shape()
+            )
+        ]
+
+    containers: List[TensorContainer] = []
+    blocks: List[Tuple[object, TensorPiece]] = []
+    for mat_id, mat in tensors.items():
+        for _, piece in tensor_decomposition(mat_id, mat, container_size, padding_size):
+            # extract the piece which can obtain whole container
+            if piece.shape == container_size:
+                containers.append(TensorContainer(container_size, [TensorPieceMapping(
+                    original_id=mat_id,
+                    container_loc=TensorPiece([0] * container_size.ndim, container_size.dims),
+                    original_loc=piece,
+                    padding=padding_size
+                )]))
+            else:
+                blocks.append((mat_id, piece))
+
+    # Slabs and bars are the largest ones, so they will be stacked first
+    blocks.sort(key=lambda id_piece: id_piece[1].volume, reverse=True)
+    block_keys = [-piece.volume for _, piece in blocks]
+    while len(blocks) > 0:
+        containers.append(TensorContainer(
+            container_size,
+            fill_with_blocks(
+                TensorPiece([0] * container_size.ndim, container_size.dims),
+                blocks,
+                block_keys,
+                channel_axes
+            )
+        ))
+    return containers
@@ -0,0 +1,47 @@
+import unittest
+from unittest import mock
+
+from cake_cutting import MatrixShape, arrangement_generator
+from cake_cutting import algorithm
+from cake_cutting.algorithm import arrange_pieces, check_matrixes, decompose_matrixes
+from cake_cutting.test.stress_test import random_case
+from cake_cutting.verification import verify_arrangement
+
+
+def dump(containers):
+    return [[str(piece) for piece in cake_container.pieces] for cake_container in containers]
+
+
+class GeneratorTest(unittest.TestCase):
+
+    def test_same_as_decompose_then_arrange(self):
+        for seed in range(5):
+            with self.subTest(seed=seed):
+                matrixes, container_size, padding_size = random_case(seed, 30)
+                containers = list(arrangement_generator(matrixes, container_size, padding_size))
+                verify_arrangement(matrixes, containers, container_size, padding_size)
+                # The arrangement of decomposing all the matrixes before packing
+                matrixes, padding_size = check_matrixes(matrixes, container_size, padding_size)
+                expected = arrange_pieces(
+                    decompose_matrixes(matrixes, container_size, padding_size),
+                    container_size, padding_size
+                )
+                self.assertEqual(dump(expected), dump(containers))
+
+    def test_full_container_before_decomposing_all(self):
+        matrixes = [MatrixShape(300, 300), MatrixShape(300, 300)]
+        with mock.patch.object(
+                algorithm, "matrix_decomposition", wraps=algorithm.matrix_decomposition
+        ) as decomposition:
+            generator = arrangement_generator(matrixes, MatrixShape(120, 120), MatrixShape(10, 10))
+            self.assertEqual(0, decomposition.call_count)
+            first = next(generator)
+            self.assertEqual(1, decomposition.call_count)
+            self.assertEqual(1, len(first.pieces))
+            self.assertEqual(0, first.pieces[0].original_id)
+            list(generator)
+            self.assertEqual(2, decomposition.call_count)
+
+    def test_check_before_generating(self):
+        with self.assertRaises(ValueError):
+            arrangement_generator([MatrixShape(10, 10)], MatrixShape(120, 120), MatrixShape(10, 10))
@@ -0,0 +1,44 @@
+"""
+Seeded arrangement harness shared by the stress test and the benchmarks.
+"""
+import argparse
+import logging
+import time
+from typing import Callable
+
+log = logging.getLogger(__file__)
+
+
+def run_case(generate_case: Callable, arrange: Callable, verify: Callable, seed: int, count: int) -> float:
+    """
+    Arrange a random case and verify it
+    :param generate_case: (seed, count) -> (inputs, container_size, padding_size)
+    :param arrange: the arrangement algorithm, (inputs, container_size, padding_size) -> containers
+    :param verify: the verification, (inputs, containers, container_size, padding_size) -> utilize rate
+    :param seed: random seed
+    :param count: count of inputs
+    :return: utilize rate
+    """
+    inputs, container_size, padding_size = generate_case(seed, count)
+    start = time.time()
+    containers = arrange(inputs, container_size, padding_size)
+    arranged = time.time()
+    utilize_rate = verify(inputs, containers, container_size, padding_size)
+    log.info("{} seed {}: {} inputs, {} pieces in {} containers, arrange {:.2f}s, verify {:.2f}s, "
+             "utilize rate={:.2f}%".format(
+                 arrange.__name__, seed, count, sum(len(c.pieces) for c in containers), len(containers),
+                 arranged - start, time.time() - arranged, utilize_rate * 100.0
+             ))
+    return utilize_rate
+
+
+def main(generate_case: Callable, arrange: Callable, verify: Callable, default_count: int):
+    """
+    Command line entry to run a large-scale case
+    """
+    parser = argparse.ArgumentParser(description=f"Benchmark of {arrange.__name__}")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--count", type=int, default=default_count)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    run_case(generate_case, arrange, verify, args.seed, args.count)
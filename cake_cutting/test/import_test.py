@@ -0,0 +1,85 @@
+import json
+import logging
+import os
+import subprocess
+import sys
+import unittest
+
+log = logging.getLogger(__file__)
+
+# Budget of importing the shape types in a fresh interpreter (seconds)
+SHAPE_IMPORT_BUDGET = 0.02
+SHAPE_IMPORT = "from cake_cutting import MatrixShape, MatrixPiece"
+# Directory which contains the package `cake_cutting`
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_PROBE_SCRIPT = """
+import json, sys, time
+before = set(sys.modules)
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed": elapsed, "loaded": sorted(set(sys.modules) - before)}}))
+"""
+
+
+def probe_import(statement: str):
+    """
+    Run the import statement in a fresh interpreter
+    :param statement: import statement to run
+    :return: (elapsed seconds, list of the modules loaded by the statement)
+    """
+    output = subprocess.check_output(
+        [sys.executable, "-c", _PROBE_SCRIPT.format(statement=statement)],
+        cwd=PROJECT_ROOT
+    )
+    result = json.loads(output.decode("utf-8"))
+    return result["elapsed"], result["loaded"]
+
+
+class ImportTest(unittest.TestCase):
+
+    def test_bare_import_is_lazy(self):
+        elapsed, loaded = probe_import("import cake_cutting")
+        log.info("import cake_cutting took {:.2f}ms, loaded: {}".format(elapsed * 1000, loaded))
+        self.assertEqual(["cake_cutting"], [m for m in loaded if m.startswith("cake_cutting")])
+        self.assertNotIn("typing", loaded)
+
+    def test_shape_import_budget(self):
+        # Take the best of several runs to get rid of the noise from the disk cache
+        elapsed = min(probe_import(SHAPE_IMPORT)[0] for _ in range(5))
+        log.info("{} took {:.2f}ms".format(SHAPE_IMPORT, elapsed * 1000))
+        self.assertLess(elapsed, SHAPE_IMPORT_BUDGET)
+
+    def test_shape_import_is_lightweight(self):
+        _, loaded = probe_import(SHAPE_IMPORT)
+        self.assertIn("cake_cutting.basics", loaded)
+        self.assertNotIn("cake_cutting.algorithm", loaded)
+        self.assertNotIn("cake_cutting.utils", loaded)
+        self.assertNotIn("typing", loaded)
+        self.assertNotIn("logging", loaded)
+
+    def test_algorithm_loaded_on_first_use(self):
+        _, loaded = probe_import(
+            "import cake_cutting\n"
+            "cake_cutting.arrangement_algorithm"
+        )
+        self.assertIn("cake_cutting.algorithm", loaded)
+        self.assertIn("cake_cutting.utils.sorted_collection", loaded)
+
+    def test_submodule_access(self):
+        _, loaded = probe_import(
+            "import cake_cutting\n"
+            "cake_cutting.algorithm.matrix_decomposition\n"
+            "cake_cutting.utils.SortedCollection\n"
+            "cake_cutting.verification.verify_arrangement"
+        )
+        self.assertIn("cake_cutting.algorithm", loaded)
+        self.assertIn("cake_cutting.verification", loaded)
+        import cake_cutting
+        self.assertIs(cake_cutting.basics.MatrixShape, cake_cutting.MatrixShape)
+
+    def test_unknown_attribute(self):
+        import cake_cutting
+        with self.assertRaises(AttributeError):
+            getattr(cake_cutting, "not_exists")
@@ -0,0 +1,112 @@
+import unittest
+
+from cake_cutting import MatrixShape, MatrixPiece, CakeContainer, PieceMapping
+from cake_cutting import arrangement_algorithm, rearrangement_algorithm
+from cake_cutting.algorithm import free_pieces
+from cake_cutting.test.stress_test import random_case
+from cake_cutting.verification import verify_arrangement, find_overlapping
+
+
+class FreePiecesTest(unittest.TestCase):
+
+    def test_empty_container(self):
+        cake_container = CakeContainer(MatrixShape(100, 80), [])
+        self.assertEqual([(0, 0, 100, 80)], [p.location for p in free_pieces(cake_container)])
+
+    def test_free_pieces_complement(self):
+        container_size = MatrixShape(100, 80)
+        cake_container = CakeContainer(container_size, [
+            PieceMapping("a", MatrixPiece(0, 0, 30, 80), MatrixPiece(0, 0, 30, 80)),
+            PieceMapping("b", MatrixPiece(50, 20, 20, 10), MatrixPiece(0, 0, 20, 10)),
+        ])
+        pieces = free_pieces(cake_container)
+        self.assertIsNone(find_overlapping(pieces + [p.container_loc for p in cake_container.pieces]))
+        self.assertEqual(container_size.area - 30 * 80 - 20 * 10, sum(p.area for p in pieces))
+
+
+class RearrangementTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.matrixes, self.container_size, self.padding_size = random_case(7, 30)
+        self.containers = arrangement_algorithm(self.matrixes, self.container_size, self.padding_size)
+
+    def rearrange(self, added, removed):
+        before = {id(c): list(c.pieces) for c in self.containers}
+        changed, dropped = rearrangement_algorithm(
+            self.containers, self.container_size,
+            added=added, removed=removed, padding_size=self.padding_size
+        )
+        for mat_id in removed:
+            del self.matrixes[mat_id]
+        self.matrixes.update(added)
+        verify_arrangement(self.matrixes, self.containers, self.container_size, self.padding_size)
+        # The containers not returned must be untouched
+        changed_ids = set(id(c) for c in changed)
+        for cake_container in self.containers:
+            if id(cake_container) not in changed_ids:
+                self.assertEqual(before[id(cake_container)], cake_container.pieces)
+        # Each old container is either still in the arrangement or reported as dropped
+        dropped_ids = set(id(c) for c in dropped)
+        current_ids = set(id(c) for c in self.containers)
+        self.assertEqual(set(before.keys()), (current_ids & set(before.keys())) | dropped_ids)
+        self.assertFalse(dropped_ids & current_ids)
+        self.assertTrue(all(len(c.pieces) == 0 for c in dropped))
+        self.assertTrue(changed_ids <= current_ids)
+        return changed, dropped
+
+    def test_remove(self):
+        mat_id = next(iter(self.matrixes))
+        changed, _ = self.rearrange({}, [mat_id])
+        for cake_container in changed:
+            self.assertTrue(all(p.original_id != mat_id for p in cake_container.pieces))
+
+    def test_add_into_free_space(self):
+        count = len(self.containers)
+        small = MatrixShape(self.padding_size.width * 2 + 1, self.padding_size.height * 2 + 1)
+        changed, _ = self.rearrange({"late": small}, [])
+        self.assertEqual(1, len(changed))
+        self.assertEqual(count, len(self.containers))
+
+    def test_replace(self):
+        removed = list(self.matrixes.keys())[:5]
+        added = {f"late-{i}": mat for i, mat in enumerate(list(self.matrixes.values())[5:10])}
+        self.rearrange(added, removed)
+
+    def test_resize(self):
+        mat_id = next(iter(self.matrixes))
+        self.rearrange({mat_id: list(self.matrixes.values())[1]}, [mat_id])
+
+    def test_remove_all(self):
+        containers = list(self.containers)
+        changed, dropped = self.rearrange({}, list(self.matrixes.keys()))
+        self.assertEqual([], changed)
+        self.assertEqual([id(c) for c in containers], [id(c) for c in dropped])
+        self.assertEqual([], self.containers)
+
+    def test_drop_full_containers(self):
+        self.matrixes = {"a": MatrixShape(230, 230), "b": MatrixShape(50, 50)}
+        self.container_size, self.padding_size = MatrixShape(120, 120), MatrixShape(10, 10)
+        self.containers = arrangement_algorithm(self.matrixes, self.container_size, self.padding_size)
+        only_a = [id(c) for c in self.containers if all(p.original_id == "a" for p in c.pieces)]
+        self.assertGreaterEqual(len(only_a), 4)
+        _, dropped = self.rearrange({}, ["a"])
+        self.assertEqual(only_a, [id(c) for c in dropped])
+
+    def test_reuse_emptied_containers(self):
+        mat_id = max(self.matrixes, key=lambda k: self.matrixes[k].area)
+        count = len(self.containers)
+        changed, dropped = self.rearrange({"late": self.matrixes[mat_id]}, [mat_id])
+        self.assertEqual([], dropped)
+        self.assertEqual(count, len(self.containers))
+
+    def test_remove_unknown(self):
+        with self.assertRaises(ValueError):
+            rearrangement_algorithm(self.containers, self.container_size, removed=["zzz"])
+
+    def test_add_existing(self):
+        mat_id = next(iter(self.matrixes))
+        with self.assertRaises(ValueError):
+            rearrangement_algorithm(
+                self.containers, self.container_size,
+                added={mat_id: self.matrixes[mat_id]}, padding_size=self.padding_size
+            )
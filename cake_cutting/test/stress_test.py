@@ -0,0 +1,55 @@
+"""
+Seeded stress test of arrangement_algorithm, verified by cake_cutting.verification.
+Run a large-scale case by: python -m cake_cutting.test.stress_test --seed 0 --count 1000
+"""
+import random
+import unittest
+
+from cake_cutting import MatrixShape, arrangement_algorithm
+from cake_cutting.test import harness
+from cake_cutting.verification import verify_arrangement
+
+SEEDS = range(20)
+MATRIX_COUNT = 50
+
+
+def random_case(seed: int, count: int):
+    """
+    Generate a reproducible input of arrangement_algorithm
+    :param seed: random seed
+    :param count: count of matrixes
+    :return: matrixes, container_size, padding_size
+    """
+    rng = random.Random(seed)
+    padding_size = MatrixShape(rng.randint(0, 16), rng.randint(0, 16))
+    container_size = MatrixShape(
+        rng.randint(2 * padding_size.width + 1, 256),
+        rng.randint(2 * padding_size.height + 1, 256),
+    )
+    matrixes = {}
+    for i in range(count):
+        # Mix the matrixes smaller than the container with the large ones
+        scale = rng.choice((1, 2, 16))
+        matrixes[f"im-{i}"] = MatrixShape(
+            rng.randint(2 * padding_size.width + 1, container_size.width * scale),
+            rng.randint(2 * padding_size.height + 1, container_size.height * scale),
+        )
+    return matrixes, container_size, padding_size
+
+
+class StressTest(unittest.TestCase):
+
+    def test_random_cases(self):
+        for seed in SEEDS:
+            with self.subTest(seed=seed):
+                harness.run_case(random_case, arrangement_algorithm, verify_arrangement, seed, MATRIX_COUNT)
+
+    def test_reproducible(self):
+        self.assertEqual(
+            [m.tuple for m in random_case(42, 10)[0].values()],
+            [m.tuple for m in random_case(42, 10)[0].values()],
+        )
+
+
+if __name__ == '__main__':
+    harness.main(random_case, arrangement_algorithm, verify_arrangement, 1000)
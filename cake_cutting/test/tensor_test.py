@@ -0,0 +1,119 @@
+"""
+Tests of the N-dimensional arrangement.
+Run the benchmark on volume-sized inputs by: python -m cake_cutting.test.tensor_test --count 20
+"""
+import random
+import unittest
+
+from cake_cutting import TensorShape, TensorPiece, MatrixShape, arrangement_algorithm, tensor_arrangement_algorithm
+from cake_cutting.test import harness
+from cake_cutting.verification import verify_tensor_arrangement, find_tensor_overlapping
+
+
+def random_volumes(seed: int, count: int):
+    """
+    Generate reproducible scan-like volumes
+    :param seed: random seed
+    :param count: count of volumes
+    :return: volumes, container_size, padding_size
+    """
+    rng = random.Random(seed)
+    volumes = {
+        f"scan-{i}": TensorShape(rng.randint(256, 512), rng.randint(256, 512), rng.randint(40, 400))
+        for i in range(count)
+    }
+    return volumes, TensorShape(128, 128, 64), TensorShape(8, 8, 4)
+
+
+class TensorShapeTest(unittest.TestCase):
+
+    def test_shape(self):
+        shape = TensorShape(3, 4, 5)
+        self.assertEqual(shape, TensorShape((3, 4, 5)))
+        self.assertEqual((3, 4, 5), shape.shape)
+        self.assertEqual(60, shape.volume)
+        self.assertIn(TensorShape(2, 3, 4), shape)
+        self.assertNotIn(TensorShape(3, 3, 4), shape)
+        self.assertTrue(TensorShape(3, 3, 4).fits(shape))
+
+    def test_piece(self):
+        piece = TensorPiece((1, 2, 3), (4, 5, 6))
+        self.assertEqual((5, 7, 9), piece.end)
+        self.assertEqual("[1:5,2:7,3:9]", str(piece))
+        self.assertEqual((slice(1, 5), slice(2, 7), slice(3, 9)), piece.slices)
+
+    def test_find_overlapping(self):
+        pieces = [TensorPiece((x, y, z), (10, 10, 10)) for x in (0, 10) for y in (0, 10) for z in (0, 10)]
+        self.assertIsNone(find_tensor_overlapping(pieces))
+        pieces.append(TensorPiece((5, 5, 5), (1, 1, 1)))
+        self.assertIsNotNone(find_tensor_overlapping(pieces))
+
+
+class TensorArrangementTest(unittest.TestCase):
+
+    def test_volumes(self):
+        for seed in range(3):
+            with self.subTest(seed=seed):
+                harness.run_case(random_volumes, tensor_arrangement_algorithm, verify_tensor_arrangement, seed, 3)
+
+    def test_small_volumes(self):
+        rng = random.Random(0)
+        volumes = [TensorShape(rng.randint(3, 40), rng.randint(3, 40), rng.randint(3, 40)) for _ in range(100)]
+        container_size = TensorShape(48, 48, 48)
+        padding_size = TensorShape(1, 1, 1)
+        containers = tensor_arrangement_algorithm(volumes, container_size, padding_size)
+        utilize_rate = verify_tensor_arrangement(volumes, containers, container_size, padding_size)
+        self.assertGreater(utilize_rate, 0.5)
+
+    def test_channel_axis(self):
+        container_size, padding_size = TensorShape(120, 120, 3), TensorShape(10, 10, 0)
+        rng = random.Random(0)
+        volumes = {f"rgb-{i}": TensorShape(rng.randint(21, 300), rng.randint(21, 300), 3) for i in range(20)}
+        containers = tensor_arrangement_algorithm(volumes, container_size, padding_size, channel_axes=(2,))
+        verify_tensor_arrangement(volumes, containers, container_size, padding_size, channel_axes=(2,))
+        for tensor_container in containers:
+            for piece in tensor_container.pieces:
+                self.assertEqual((0, 3), (piece.container_loc.offset[2], piece.container_loc.dims[2]))
+
+    def test_mixed_channel_counts(self):
+        container_size, padding_size = TensorShape(120, 120, 3), TensorShape(10, 10, 0)
+        for volumes in (
+                {"g1": TensorShape(50, 50, 1), "g2": TensorShape(50, 50, 1)},
+                {"g1": TensorShape(50, 50, 1), "rgb": TensorShape(50, 50, 3)},
+        ):
+            with self.subTest(volumes=sorted(volumes)):
+                with self.assertRaisesRegex(ValueError, "channels"):
+                    tensor_arrangement_algorithm(volumes, container_size, padding_size, channel_axes=(2,))
+        # Without channel axes the grey images are stacked along the last axis
+        volumes = {"g1": TensorShape(50, 50, 1), "g2": TensorShape(50, 50, 1)}
+        containers = tensor_arrangement_algorithm(volumes, container_size, padding_size)
+        with self.assertRaisesRegex(ValueError, "channel axis"):
+            verify_tensor_arrangement(volumes, containers, container_size, padding_size, channel_axes=(2,))
+
+    def test_padded_channel_axis(self):
+        with self.assertRaises(ValueError):
+            tensor_arrangement_algorithm(
+                [TensorShape(50, 50, 3)], TensorShape(120, 120, 3), TensorShape(10, 10, 1), channel_axes=(2,)
+            )
+
+    def test_2d_same_as_matrix(self):
+        matrixes = {f"im-{i}": MatrixShape(200 + i * 17, 300 - i * 13) for i in range(5)}
+        containers = tensor_arrangement_algorithm(
+            {k: TensorShape.from_matrix_shape(v) for k, v in matrixes.items()},
+            TensorShape(120, 120), TensorShape(10, 10)
+        )
+        cake_containers = arrangement_algorithm(matrixes, MatrixShape(120, 120), MatrixShape(10, 10))
+        self.assertEqual(
+            [[(p.original_id, p.original_loc.location, p.container_loc.location) for p in c.pieces]
+             for c in cake_containers],
+            [[(p.original_id, p.original_loc.location, p.container_loc.location) for p in c.pieces]
+             for c in containers],
+        )
+
+    def test_dimension_mismatch(self):
+        with self.assertRaises(ValueError):
+            tensor_arrangement_algorithm([TensorShape(10, 10)], TensorShape(8, 8, 8))
+
+
+if __name__ == '__main__':
+    harness.main(random_volumes, tensor_arrangement_algorithm, verify_tensor_arrangement, 20)
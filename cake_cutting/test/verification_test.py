@@ -0,0 +1,70 @@
+import unittest
+
+from cake_cutting import MatrixShape, MatrixPiece, CakeContainer, PieceMapping, arrangement_algorithm
+from cake_cutting.algorithm import fill_with_small_block
+from cake_cutting.verification import find_overlapping, verify_arrangement
+
+
+class FindOverlappingTest(unittest.TestCase):
+
+    def test_adjacent_pieces(self):
+        pieces = [MatrixPiece(x, y, 10, 10) for x in range(0, 100, 10) for y in range(0, 100, 10)]
+        self.assertIsNone(find_overlapping(pieces))
+
+    def test_overlapping_pieces(self):
+        pieces = [
+            MatrixPiece(0, 0, 10, 10),
+            MatrixPiece(0, 10, 10, 10),
+            MatrixPiece(20, 0, 10, 30),
+            MatrixPiece(5, 15, 20, 2),
+        ]
+        self.assertEqual((1, 3), find_overlapping(pieces))
+
+    def test_contained_piece(self):
+        pieces = [MatrixPiece(0, 0, 100, 100), MatrixPiece(40, 40, 10, 10)]
+        self.assertEqual((0, 1), find_overlapping(pieces))
+
+    def test_empty_piece_ignored(self):
+        pieces = [MatrixPiece(0, 0, 10, 10), MatrixPiece(5, 5, 0, 3)]
+        self.assertIsNone(find_overlapping(pieces))
+
+
+class VerifyArrangementTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.matrixes = {"a": MatrixShape(300, 200), "b": MatrixShape(50, 40)}
+        self.container_size = MatrixShape(120, 120)
+        self.padding_size = MatrixShape(10, 10)
+
+    def test_valid_arrangement(self):
+        containers = arrangement_algorithm(self.matrixes, self.container_size, self.padding_size)
+        utilize_rate = verify_arrangement(self.matrixes, containers, self.container_size, self.padding_size)
+        self.assertTrue(0 < utilize_rate <= 1)
+
+    def test_missing_piece(self):
+        containers = arrangement_algorithm(self.matrixes, self.container_size, self.padding_size)
+        containers[0].pieces.pop()
+        with self.assertRaises(ValueError):
+            verify_arrangement(self.matrixes, containers, self.container_size, self.padding_size)
+
+    def test_overlapping_in_container(self):
+        containers = arrangement_algorithm(self.matrixes, self.container_size, self.padding_size)
+        piece = containers[-1].pieces[0]
+        containers[-1].pieces.append(PieceMapping(piece.original_id, piece.container_loc, piece.original_loc))
+        with self.assertRaisesRegex(ValueError, "overlapped in container"):
+            verify_arrangement(self.matrixes, containers, self.container_size, self.padding_size)
+
+    def test_out_of_container(self):
+        containers = [CakeContainer(self.container_size, [PieceMapping(
+            "b", MatrixPiece(100, 100, 50, 40), MatrixPiece(0, 0, 50, 40)
+        )])]
+        with self.assertRaisesRegex(ValueError, "out of container"):
+            verify_arrangement({"b": MatrixShape(50, 40)}, containers, self.container_size)
+
+
+class FillWithSmallBlockTest(unittest.TestCase):
+
+    def test_largest_block_first(self):
+        blocks = [("large", MatrixPiece(0, 0, 50, 50)), ("small", MatrixPiece(0, 0, 10, 10))]
+        result = fill_with_small_block(MatrixPiece(0, 0, 60, 60), blocks)
+        self.assertEqual("large", result[0].original_id)
@@ -0,0 +1,207 @@
+"""
+Verify an arrangement without rasterizing the containers or the matrixes.
+Overlapping is detected by a sweep-line over the x axis, coverage is checked by area accounting:
+the valid (unpadded) parts of the pieces cut from a matrix must not overlap each other,
+so they cover the valid part of the matrix exactly when the sum of their areas equals its area.
+The N-dimensional pieces are checked the same way, by volume.
+"""
+import heapq
+import logging
+from bisect import bisect_left
+from typing import Union, Mapping, List, Sequence, Tuple, Optional
+
+from .basics import CakeContainer, MatrixShape, MatrixPiece, TensorContainer, TensorShape, TensorPiece
+
+log = logging.getLogger(__file__)
+
+
+def find_overlapping(pieces: Sequence[MatrixPiece]) -> Optional[Tuple[int, int]]:
+    """
+    Find a pair of overlapping pieces by sweep-line, O(n log n) while no overlapping found
+    :param pieces: pieces to check, empty pieces are ignored
+    :return: the indexes of the overlapping pieces or None if no overlapping
+    """
+    order = sorted(
+        (i for i, piece in enumerate(pieces) if piece.width > 0 and piece.height > 0),
+        key=lambda i: pieces[i].left
+    )
+    # The active pieces never overlap each other, so their y-intervals can be kept sorted by the top
+    active_tops: List[int] = []
+    active_ids: List[int] = []
+    active_rights: List[Tuple[int, int]] = []
+    for i in order:
+        piece = pieces[i]
+        while active_rights and active_rights[0][0] <= piece.left:
+            _, j = heapq.heappop(active_rights)
+            k = bisect_left(active_tops, pieces[j].top)
+            del active_tops[k]
+            del active_ids[k]
+        k = bisect_left(active_tops, piece.top)
+        if k > 0 and pieces[active_ids[k - 1]].bottom > piece.top:
+            return active_ids[k - 1], i
+        if k < len(active_tops) and active_tops[k] < piece.bottom:
+            return active_ids[k], i
+        active_tops.insert(k, piece.top)
+        active_ids.insert(k, i)
+        heapq.heappush(active_rights, (piece.right, i))
+    return None
+
+
+def _inside(piece: MatrixPiece, shape: MatrixShape) -> bool:
+    return piece.left >= 0 and piece.top >= 0 and piece.right <= shape.width and piece.bottom <= shape.height
+
+
+def verify_arrangement(
+        matrixes: Union[Sequence[MatrixShape], Mapping[str, MatrixShape]],
+        containers: Sequence[CakeContainer],
+        container_size: MatrixShape,
+        padding_size: MatrixShape = None
+) -> float:
+    """
+    Check the containers are a valid arrangement of the matrixes, raise ValueError if not
+    :param matrixes: the input of arrangement_algorithm
+    :param containers: the output of arrangement_algorithm
+    :param container_size: container_size
+    :param padding_size: padding size default (0,0) means no padding
+    :return: utilize rate of the containers
+    """
+    if isinstance(matrixes, Sequence):
+        matrixes: Mapping[str, MatrixShape] = {i: v for i, v in enumerate(matrixes)}
+    padding_size = padding_size if padding_size is not None else MatrixShape(0, 0)
+
+    sum_piece_area = 0
+    valid_pieces = {mat_id: [] for mat_id in matrixes.keys()}
+    for container_id, cake_container in enumerate(containers):
+        if cake_container.container_size != container_size:
+            raise ValueError(f"Container #{container_id} size {cake_container.container_size.shape} not correct.")
+        for piece_mapping in cake_container.pieces:
+            if not _inside(piece_mapping.container_loc, container_size):
+                raise ValueError(f"Piece {str(piece_mapping)} out of container #{container_id}.")
+            mat_id = piece_mapping.original_id
+            if mat_id not in matrixes:
+                raise ValueError(f"Piece {str(piece_mapping)} in container #{container_id} from unknown matrix.")
+            if not _inside(piece_mapping.original_loc, matrixes[mat_id]):
+                raise ValueError(f"Piece {str(piece_mapping)} out of matrix {mat_id}.")
+            original_loc = piece_mapping.original_loc
+            valid_pieces[mat_id].append(MatrixPiece(
+                original_loc.left + padding_size.width,
+                original_loc.top + padding_size.height,
+                max(original_loc.width - 2 * padding_size.width, 0),
+                max(original_loc.height - 2 * padding_size.height, 0),
+            ))
+            sum_piece_area += piece_mapping.area
+        overlapping = find_overlapping([piece_mapping.container_loc for piece_mapping in cake_container.pieces])
+        if overlapping is not None:
+            i, j = overlapping
+            raise ValueError(f"Piece {str(cake_container.pieces[i])} and {str(cake_container.pieces[j])} "
+                             f"overlapped in container #{container_id}.")
+
+    for mat_id, mat in matrixes.items():
+        pieces = valid_pieces[mat_id]
+        overlapping = find_overlapping(pieces)
+        if overlapping is not None:
+            i, j = overlapping
+            raise ValueError(f"Piece {str(pieces[i])} and {str(pieces[j])} overlapped in matrix {mat_id}.")
+        valid_area = (mat.width - 2 * padding_size.width) * (mat.height - 2 * padding_size.height)
+        covered_area = sum(piece.area for piece in pieces)
+        if covered_area != valid_area:
+            raise ValueError(f"Some pixel uncovered in matrix {mat_id}: {covered_area} of {valid_area} covered.")
+
+    all_container_area = len(containers) * container_size.area
+    return sum_piece_area * 1.0 / all_container_area if all_container_area > 0 else 0.0
+
+
+def find_tensor_overlapping(pieces: Sequence[TensorPiece]) -> Optional[Tuple[int, int]]:
+    """
+    Find a pair of overlapping N-dimensional pieces by sweep-line over the first axis
+    :param pieces: pieces to check, empty pieces are ignored
+    :return: the indexes of the overlapping pieces or None if no overlapping
+    """
+    order = sorted(
+        (i for i, piece in enumerate(pieces) if all(d > 0 for d in piece.dims)),
+        key=lambda i: pieces[i].offset[0]
+    )
+    active: List[int] = []
+    for i in order:
+        piece = pieces[i]
+        piece_end = piece.end
+        active = [j for j in active if pieces[j].end[0] > piece.offset[0]]
+        for j in active:
+            other_end = pieces[j].end
+            if all(
+                    p < oe and o < pe
+                    for p, pe, o, oe in zip(piece.offset[1:], piece_end[1:], pieces[j].offset[1:], other_end[1:])
+            ):
+                return j, i
+        active.append(i)
+    return None
+
+
+def _tensor_inside(piece: TensorPiece, shape: TensorShape) -> bool:
+    return piece.ndim == shape.ndim and all(o >= 0 for o in piece.offset) and all(
+        e <= s for e, s in zip(piece.end, shape.dims))
+
+
+def verify_tensor_arrangement(
+        tensors: Union[Sequence[TensorShape], Mapping[str, TensorShape]],
+        containers: Sequence[TensorContainer],
+        container_size: TensorShape,
+        padding_size: TensorShape = None,
+        channel_axes: Sequence[int] = ()
+) -> float:
+    """
+    N-dimensional version of verify_arrangement, raise ValueError if the arrangement is invalid
+    :param tensors: the input of tensor_arrangement_algorithm
+    :param containers: the output of tensor_arrangement_algorithm
+    :param container_size: container_size
+    :param padding_size: padding size default (0,...) means no padding
+    :param channel_axes: the axes every piece must span wholly in the container
+    :return: utilize rate of the containers
+    """
+    if isinstance(tensors, Sequence):
+        tensors: Mapping[str, TensorShape] = {i: v for i, v in enumerate(tensors)}
+    padding_size = padding_size if padding_size is not None else TensorShape([0] * container_size.ndim)
+
+    sum_piece_volume = 0
+    valid_pieces = {mat_id: [] for mat_id in tensors.keys()}
+    for container_id, tensor_container in enumerate(containers):
+        if tensor_container.container_size != container_size:
+            raise ValueError(f"Container #{container_id} size {tensor_container.container_size.shape} not correct.")
+        for piece_mapping in tensor_container.pieces:
+            if not _tensor_inside(piece_mapping.container_loc, container_size):
+                raise ValueError(f"Piece {str(piece_mapping)} out of container #{container_id}.")
+            for axis in channel_axes:
+                if piece_mapping.container_loc.offset[axis] != 0 or \
+                        piece_mapping.container_loc.dims[axis] != container_size.dims[axis]:
+                    raise ValueError(f"Piece {str(piece_mapping)} doesn't span channel axis {axis} "
+                                     f"in container #{container_id}.")
+            mat_id = piece_mapping.original_id
+            if mat_id not in tensors:
+                raise ValueError(f"Piece {str(piece_mapping)} in container #{container_id} from unknown tensor.")
+            if not _tensor_inside(piece_mapping.original_loc, tensors[mat_id]):
+                raise ValueError(f"Piece {str(piece_mapping)} out of tensor {mat_id}.")
+            original_loc = piece_mapping.original_loc
+            valid_pieces[mat_id].append(TensorPiece(
+                [o + p for o, p in zip(original_loc.offset, padding_size.dims)],
+                [max(d - 2 * p, 0) for d, p in zip(original_loc.dims, padding_size.dims)],
+            ))
+            sum_piece_volume += piece_mapping.volume
+        overlapping = find_tensor_overlapping([piece_mapping.container_loc for piece_mapping in tensor_container.pieces])
+        if overlapping is not None:
+            i, j = overlapping
+            raise ValueError(f"Piece {str(tensor_container.pieces[i])} and {str(tensor_container.pieces[j])} "
+                             f"overlapped in container #{container_id}.")
+
+    for mat_id, mat in tensors.items():
+        pieces = valid_pieces[mat_id]
+        overlapping = find_tensor_overlapping(pieces)
+        if overlapping is not None:
+            i, j = overlapping
+            raise ValueError(f"Piece {str(pieces[i])} and {str(pieces[j])} overlapped in tensor {mat_id}.")
+        valid_volume = TensorShape([d - 2 * p for d, p in zip(mat.dims, padding_size.dims)]).volume
+        covered_volume = sum(piece.volume for piece in pieces)
+        if covered_volume != valid_volume:
+            raise ValueError(f"Some pixel uncovered in tensor {mat_id}: {covered_volume} of {valid_volume} covered.")
+
+    all_container_volume = len(containers) * container_size.volume
+    return sum_piece_volume * 1.0 / all_container_volume if all_container_volume > 0 else 0.0